@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 
 # build-in modules
+import functools
 import time
 import random
 
+# Set to False to skip building and printing the timing report.
+ENABLE_TIMING = True
+
 
 def set_timer(func):
     """
@@ -16,7 +20,8 @@ def set_timer(func):
         callable: The wrapped function.
     """
 
-    def wrapper(*args, **kwargs):
+    @functools.wraps(func)
+    def wrapper(*args, _pc=time.perf_counter_ns, **kwargs):
         """
         Wrapper function to measure the execution time of the decorated function.
 
@@ -27,11 +32,11 @@ def set_timer(func):
         Returns:
             The result of the decorated function.
         """
-        start = time.time()
+        start = _pc()
         result = func(*args, **kwargs)
-        end = time.time()
-        time_passed = end - start
-        print(f"The function {func.__name__} took {time_passed} seconds.")
+        time_passed = _pc() - start
+        if ENABLE_TIMING:
+            print(f"The function {func.__name__} took {time_passed / 1e9} seconds.")
         return result
     return wrapper
 
@@ -27,31 +27,201 @@ THE SOFTWARE.
 """
 
 # Build-in libraries
+import ctypes
+import errno
 import logging
+import logging.handlers
+import os
+import queue
 import time
 import socket
+import sys
 
 # Initialize logging here
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# The receive loop only merges each message and queues the record; the listener thread owns the stream
+# handler, where the timestamp formatting and the stderr write happen.
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+logging.root.addHandler(logging.handlers.QueueHandler(log_queue))
+logging.root.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# recvmmsg(2) flag: block until the first datagram arrives, then return whatever else is already queued.
+MSG_WAITFORONE = 0x10000
+# Truncation flag reported by recvmsg(2)/recvmmsg(2). The socket module only defines it where recvmsg exists;
+# on Windows oversize datagrams show up as a WSAEMSGSIZE error instead, which the receiver maps to this flag.
+MSG_TRUNC = getattr(socket, "MSG_TRUNC", 0x20)
+# Winsock error raised by recvfrom when a datagram is larger than the buffer it is read into.
+WSAEMSGSIZE = 10040
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+def _load_recvmmsg():
+    """
+    Look up recvmmsg(2) in the C library.
+
+    Returns:
+        The ctypes function, or None when the platform does not provide it.
+    """
+
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        recvmmsg = libc.recvmmsg
+    except (OSError, AttributeError):
+        return None
+    recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    recvmmsg.restype = ctypes.c_int
+    return recvmmsg
+
+
+class DatagramReceiver:
+    """
+    Read IPv4 UDP datagrams in batches, reusing the same buffers for every call.
+
+    On Linux a single recvmmsg(2) call drains up to `batch_size` datagrams; elsewhere it
+    falls back to one recvmsg_into call per datagram, or recvfrom_into where recvmsg is
+    not available (Windows). There an oversize datagram fails with WSAEMSGSIZE after
+    filling the buffer; it is returned with MSG_TRUNC set and no sender address, since
+    the failed call does not report one.
+
+    Args:
+        sock (socket.socket): The bound UDP socket.
+        batch_size (int): Maximum number of datagrams returned by one `receive` call.
+        buffer_size (int): Size of each datagram buffer, in bytes.
+    """
+
+    def __init__(self, sock, batch_size, buffer_size):
+        self._sock = sock
+        self._recvmmsg = _load_recvmmsg()
+        self._buffers = [bytearray(buffer_size) for _ in range(batch_size if self._recvmmsg else 1)]
+        self._views = [memoryview(buffer) for buffer in self._buffers]
+
+        if self._recvmmsg:
+            count = len(self._buffers)
+            self._iovecs = (_IOVec * count)()
+            self._names = (_SockAddrIn * count)()
+            self._msgs = (_MMsgHdr * count)()
+            for i, buffer in enumerate(self._buffers):
+                self._iovecs[i].iov_base = ctypes.addressof((ctypes.c_char * buffer_size).from_buffer(buffer))
+                self._iovecs[i].iov_len = buffer_size
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._names[i])
+                hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+                hdr.msg_iovlen = 1
+
+    def receive(self):
+        """
+        Block until at least one datagram is available and return every datagram read.
+
+        The returned views point into the receiver's buffers and are only valid until the next call.
+
+        Returns:
+            list: `(data, flags, addr)` tuples, where `data` is a memoryview of the payload.
+        """
+
+        if not self._recvmmsg:
+            if hasattr(self._sock, "recvmsg_into"):
+                size, _, flags, addr = self._sock.recvmsg_into([self._buffers[0]])
+            else:
+                try:
+                    size, addr = self._sock.recvfrom_into(self._buffers[0])
+                    flags = 0
+                except OSError as e:
+                    if getattr(e, "winerror", None) != WSAEMSGSIZE:
+                        raise
+                    size, flags, addr = len(self._buffers[0]), MSG_TRUNC, None
+            return [(self._views[0][:size], flags, addr)]
+
+        for msg in self._msgs:
+            msg.msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+        while True:
+            count = self._recvmmsg(self._sock.fileno(), self._msgs, len(self._msgs), MSG_WAITFORONE, None)
+            if count >= 0:
+                break
+            err = ctypes.get_errno()
+            if err != errno.EINTR:
+                raise OSError(err, os.strerror(err))
+
+        messages = []
+        for i in range(count):
+            name = self._names[i]
+            addr = (socket.inet_ntoa(bytes(name.sin_addr)), socket.ntohs(name.sin_port))
+            msg = self._msgs[i]
+            messages.append((self._views[i][:msg.msg_len], msg.msg_hdr.msg_flags, addr))
+        return messages
+
 if __name__ == "__main__":
     # Script starting point.
 
     UDP_IP_ADDRESS = "127.0.0.1"
     UDP_PORT_NO = 6789
+    # Kernel receive buffer requested for the socket, large enough to absorb bursts while logging.
+    # Linux clamps it to net.core.rmem_max; raise the limit with `sysctl -w net.core.rmem_max=12582912`.
+    UDP_RCVBUF_SIZE = 8 * 1024 * 1024
+    # Largest datagram read in one call; the buffers are allocated once and reused for every message.
+    UDP_BUFFER_SIZE = 2048
+    # Maximum number of datagrams drained per receive syscall.
+    UDP_BATCH_SIZE = 64
+
+    log_listener.start()
 
     try:
         serverSock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         serverSock.bind((UDP_IP_ADDRESS, UDP_PORT_NO))
+        serverSock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF_SIZE)
         logger.info(f"UDP server started on {UDP_IP_ADDRESS}:{UDP_PORT_NO}")
+        logger.info(f"Receive buffer size: {serverSock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes")
+
+        receiver = DatagramReceiver(serverSock, UDP_BATCH_SIZE, UDP_BUFFER_SIZE)
 
         while True:
             try:
-                data, addr = serverSock.recvfrom(1024)
-                logger.info(f"Received message from {addr}: {data.decode()}")
+                messages = receiver.receive()
             except Exception as e:
-                logger.error(f"Error receiving message: {str(e)}")
+                logger.error("Error receiving message: %s", e)
+                continue
+
+            for data, flags, addr in messages:
+                try:
+                    if flags & MSG_TRUNC:
+                        logger.warning("Message from %s was larger than %d bytes and got truncated", addr, UDP_BUFFER_SIZE)
+                    # Only decode the payload when the record is going to be emitted.
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Received message from %s: %s", addr, str(data, 'utf-8'))
+                except Exception as e:
+                    logger.error("Error handling message from %s: %s", addr, e)
 
     except KeyboardInterrupt:
         logger.info('Server stopped by the user.')
@@ -60,5 +230,8 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
     finally:
-        serverSock.close()
-        logger.info("UDP server stopped")
+        try:
+            serverSock.close()
+            logger.info("UDP server stopped")
+        finally:
+            log_listener.stop()